@@ -10,6 +10,9 @@ setup(
         "pyyaml>=6.0",
         "click>=8.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.0"],
+    },
     entry_points={
         "console_scripts": [
             "inx=inx_builder.cli:main",
@@ -2,11 +2,113 @@
 Main builder class - FIXED VERSION
 """
 
+import hashlib
+import json
 import os
-import shutil
+import sys
+import xml.etree.ElementTree as ET
+from datetime import datetime
 from pathlib import Path
-from .templates import TemplateManager
-from .config import ExtensionConfig
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from . import __version__
+from .config import ExtensionConfig, Parameter
+
+# jinja2, shutil and zipfile are imported where they are used so that
+# importing the package (e.g. for ``inx --help``) stays cheap
+if TYPE_CHECKING:
+    from jinja2 import Environment, FileSystemBytecodeCache, Template
+
+
+# Bundled template sets, resolved once at import. They live in templates/ at
+# the repository root, next to src/.
+_TEMPLATES_DIR = Path(__file__).resolve().parents[2] / 'templates'
+
+# One Environment per templates directory, shared by every builder so that
+# Jinja's compiled-template cache survives across builds.
+_ENV_CACHE: Dict[Path, 'Environment'] = {}
+
+# Loaded (output name, template, source digest) entries per template set, so
+# repeated builds don't walk the template directory or go through the loader
+# again.
+_TEMPLATES_BY_NAME: Dict[Tuple[Path, str], List[Tuple[str, 'Template', bytes]]] = {}
+
+# Written next to the build output; maps each output file to the hash of the
+# template source and context it was rendered from.
+MANIFEST_NAME = '.inx_build_manifest.json'
+
+# Whitespace around <_option>/<page> children of a generated <param>
+_CHILD_INDENT = '\n    '
+_CLOSE_INDENT = '\n  '
+
+
+def _to_snake(s: str) -> str:
+    """Jinja filter: ``'My Ext'`` -> ``'my_ext'``"""
+    return s.lower().replace(' ', '_')
+
+
+def _to_camel(s: str) -> str:
+    """Jinja filter: ``'my_ext'`` -> ``'MyExt'``"""
+    return s.replace('_', ' ').title().replace(' ', '')
+
+
+def _inkscape_extensions_dir() -> Path:
+    """Return the per-user Inkscape extensions directory for this platform"""
+    if sys.platform == 'win32':
+        base = Path(os.environ.get('APPDATA', Path.home()))
+    elif sys.platform == 'darwin':
+        base = Path.home() / 'Library' / 'Application Support' / 'org.inkscape.Inkscape' / 'config'
+    else:
+        base = Path(os.environ.get('XDG_CONFIG_HOME') or Path.home() / '.config')
+    return base / 'inkscape' / 'extensions'
+
+
+def _user_cache_dir() -> Path:
+    """Return the per-user cache directory for INX Builder on this platform"""
+    if sys.platform == 'win32':
+        base = Path(os.environ.get('LOCALAPPDATA', Path.home() / 'AppData' / 'Local'))
+    elif sys.platform == 'darwin':
+        base = Path.home() / 'Library' / 'Caches'
+    else:
+        base = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache')
+    return base / 'inx-builder'
+
+
+def _bytecode_cache() -> Optional['FileSystemBytecodeCache']:
+    """Return a Jinja bytecode cache, or None if it can't be stored
+
+    Compiled templates are persisted per user so one-shot CLI runs skip the
+    lex/parse/compile step after the first invocation. A private directory
+    is used because loading cached bytecode means executing it.
+    """
+    from jinja2 import FileSystemBytecodeCache
+    
+    directory = _user_cache_dir() / 'jinja'
+    try:
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return FileSystemBytecodeCache(directory=str(directory), pattern='__jinja2_%s.cache')
+
+
+def _get_env(templates_dir: Path) -> 'Environment':
+    """Return the shared Jinja environment for ``templates_dir``"""
+    env = _ENV_CACHE.get(templates_dir)
+    if env is None:
+        from jinja2 import Environment, FileSystemLoader
+        
+        env = Environment(
+            loader=FileSystemLoader(str(templates_dir)),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            cache_size=-1,
+            auto_reload=False,
+            bytecode_cache=_bytecode_cache(),
+        )
+        env.filters['to_snake'] = _to_snake
+        env.filters['to_camel'] = _to_camel
+        env = _ENV_CACHE.setdefault(templates_dir, env)
+    return env
 
 
 class InxBuilder:
@@ -14,16 +116,93 @@ class InxBuilder:
     
     def __init__(self, config, template_name=None):
         # FIX: Handle both dict and ExtensionConfig objects
-        from .config import ExtensionConfig
         if isinstance(config, dict):
             self.config = ExtensionConfig.from_dict(config)
         else:
             self.config = config
             
-        self.template_mgr = TemplateManager()
+        self.templates_dir = _TEMPLATES_DIR
+        self.env = _get_env(self.templates_dir)
         self.output_dir = None
         self.template_name = template_name or self.config.type or 'basic_effect'
     
+    def _prepare_context(self) -> dict:
+        """Create the variables available to every template"""
+        return {
+            'config': self.config,
+            'params': self.config.parameters,
+            'ext_name': self.config.name,
+            'ext_id': self.config.id,
+            'snake_name': self.config.snake_name,
+            'camel_name': self.config.camel_name,
+            'year': datetime.now().year,
+            '_param_to_xml': self._generate_parameter,
+        }
+    
+    def _generate_parameter(self, param: Parameter) -> str:
+        """Generate the INX XML for a single parameter"""
+        # ElementTree takes care of escaping user-supplied names and texts
+        el = ET.Element('param', {'name': param.name, 'type': param.type})
+        
+        # Child elements go on their own lines inside the .inx file; their
+        # indentation is set as they are created
+        if param.type == 'notebook':
+            for page in param.pages:
+                ET.SubElement(el, 'page', {
+                    'name': page['name'],
+                    'gui-text': page.get('gui_text', page['name']),
+                }).tail = _CHILD_INDENT
+        else:
+            if param.type == 'optiongroup':
+                el.set('appearance', param.appearance)
+            if param.min is not None:
+                el.set('min', str(param.min))
+            if param.max is not None:
+                el.set('max', str(param.max))
+            el.set('gui-text', param.gui_text or param.name)
+            if param.gui_description:
+                el.set('gui-description', param.gui_description)
+            
+            if param.type == 'optiongroup':
+                for option in param.options:
+                    child = ET.SubElement(el, '_option', {'value': option.lower()})
+                    child.text = option
+                    child.tail = _CHILD_INDENT
+            elif param.type == 'boolean':
+                el.text = str(bool(param.default)).lower()
+            elif param.default is not None:
+                el.text = str(param.default)
+        
+        if len(el):
+            el.text = _CHILD_INDENT
+            el[-1].tail = _CLOSE_INDENT
+        
+        return ET.tostring(el, encoding='unicode')
+    
+    def _load_template_set(self, template_name: str) -> List[Tuple[str, 'Template', bytes]]:
+        """Return the compiled templates of a template set with their output names"""
+        key = (self.templates_dir, template_name)
+        templates = _TEMPLATES_BY_NAME.get(key)
+        if templates is None:
+            # scandir hands back names and cached file types, so no Path
+            # objects or extra stat() calls are needed per entry
+            with os.scandir(self.templates_dir / template_name) as entries:
+                names = [
+                    entry.name for entry in entries
+                    if entry.name.endswith('.j2') and entry.is_file()
+                ]
+            templates = []
+            for name in names:
+                template_path = f"{template_name}/{name}"
+                source, _, _ = self.env.loader.get_source(self.env, template_path)
+                templates.append((
+                    name[:-len('.j2')],
+                    self.env.get_template(template_path),
+                    hashlib.sha256(source.encode('utf-8')).digest(),
+                ))
+            _TEMPLATES_BY_NAME[key] = templates
+        return templates
+    
     def build(self, output_path: str = "./output", clean: bool = True) -> Path:
         """
         Build the extension
@@ -39,6 +218,7 @@ class InxBuilder:
         
         # Clean or create output directory
         if clean and self.output_dir.exists():
+            import shutil
             shutil.rmtree(self.output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
@@ -46,41 +226,167 @@ class InxBuilder:
         print(f"📁 Output: {self.output_dir}")
         
         # Create context for templates
-        context = self.template_mgr.create_context(self.config)
+        context = self._prepare_context()
         
         # Get template directory
-        template_dir = self.template_mgr.TEMPLATES_DIR / self.template_name
+        template_dir = self.templates_dir / self.template_name
         
         if not template_dir.exists():
+            fallback_dir = self.templates_dir / 'basic_effect'
+            if not fallback_dir.exists():
+                raise FileNotFoundError(
+                    f"Template '{self.template_name}' not found and no 'basic_effect' "
+                    f"fallback in {self.templates_dir}"
+                )
             print(f"⚠️ Template '{self.template_name}' not found, using 'basic_effect'")
-            template_dir = self.template_mgr.TEMPLATES_DIR / 'basic_effect'
-        
-        # Render each template file
-        for template_file in template_dir.glob("*.j2"):
-            # Render template
-            content = self.template_mgr.render_template(
-                f"{self.template_name}/{template_file.name}", 
-                context
-            )
-            
-            # Determine output filename
-            output_file = template_file.name.replace('.j2', '')
-            
+            self.template_name = 'basic_effect'
+            template_dir = fallback_dir
+        
+        # Outputs whose template and context are unchanged since the last
+        # build into this directory are left alone
+        manifest_path = self.output_dir / MANIFEST_NAME
+        try:
+            old_hashes = json.loads(manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            old_hashes = {}
+        # The package version is mixed in so that an upgrade which changes how
+        # outputs are generated invalidates entries written by older releases
+        context_digest = hashlib.sha256(repr((__version__, sorted(
+            (key, value) for key, value in context.items() if not callable(value)
+        ))).encode('utf-8')).digest()
+        new_hashes = {}
+        
+        # Work out which outputs need rendering
+        pending: List[Tuple[Path, 'Template']] = []
+        for output_file, template, source_digest in self._load_template_set(self.template_name):
             # Special handling for main files
             if output_file == 'extension.py':
-                output_file = f"{context['snake_name']}.py"
+                output_file = f"{self.config.snake_name}.py"
             elif output_file == 'extension.inx':
-                output_file = f"{context['snake_name']}.inx"
+                output_file = f"{self.config.snake_name}.inx"
             
-            # Write file
-            output_path = self.output_dir / output_file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            digest = hashlib.sha256(source_digest + context_digest).hexdigest()
+            new_hashes[output_file] = digest
+            out_file = self.output_dir / output_file
+            if old_hashes.get(output_file) == digest and out_file.exists():
+                print(f"  ✔️ Unchanged: {output_file}")
+                continue
+            pending.append((out_file, template))
+        
+        def render_one(item: Tuple[Path, 'Template']) -> None:
+            out_file, template = item
+            out_file.write_bytes(template.render(**context).encode('utf-8'))
+        
+        # Render and write the files concurrently; the context is only read
+        if len(pending) > 1:
+            from concurrent.futures import ThreadPoolExecutor
             
-            print(f"  📄 Created: {output_file}")
+            workers = min(8, len(pending), os.cpu_count() or 4)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(render_one, pending))
+        else:
+            for item in pending:
+                render_one(item)
+        
+        for out_file, _ in pending:
+            print(f"  📄 Created: {out_file.name}")
+        
+        manifest_path.write_text(json.dumps(new_hashes, indent=2), encoding='utf-8')
         
         print(f"✅ Success! Extension built in: {self.output_dir}")
         return self.output_dir
+    
+    def build_zip(self, output_path: str = "./output", compress: bool = False) -> Path:
+        """
+        Build the extension and package it as a ZIP archive
+        
+        Args:
+            output_path: Where to put the built extension
+            compress: Deflate archive members instead of storing them as-is
+            
+        Returns:
+            Path to the ZIP file
+        """
+        import zipfile
+        
+        build_dir = self.build(output_path)
+        zip_path = build_dir.parent / f"{self.config.snake_name}.zip"
+        
+        # Extensions are a handful of small text files, for which deflate
+        # costs more time than it saves space
+        compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        compresslevel = 1 if compress else None
+        
+        with zipfile.ZipFile(zip_path, 'w', compression, compresslevel=compresslevel) as zf:
+            for dirpath, _, filenames in os.walk(build_dir):
+                for filename in sorted(filenames):
+                    if filename == MANIFEST_NAME:
+                        continue
+                    file_path = os.path.join(dirpath, filename)
+                    zf.write(file_path, os.path.relpath(file_path, build_dir))
+        
+        print(f"📦 Packaged: {zip_path}")
+        return zip_path
+    
+    def install_to_inkscape(self, build_dir: Optional[str] = None) -> Path:
+        """
+        Install the built .inx and .py files into Inkscape's extensions directory
+        
+        Files are hard-linked when the build and the extensions directory
+        share a filesystem and copied otherwise. Installed files are only
+        replaced once the new link or copy is complete.
+        
+        Args:
+            build_dir: Directory holding the built extension (defaults to the
+                output of the last build())
+            
+        Returns:
+            Path to the Inkscape extensions directory
+        """
+        if build_dir is None:
+            if self.output_dir is None:
+                raise ValueError("Nothing to install, run build() first")
+            build_dir = self.output_dir
+        
+        inkscape_dir = _inkscape_extensions_dir()
+        inkscape_dir.mkdir(parents=True, exist_ok=True)
+        
+        with os.scandir(build_dir) as entries:
+            for entry in entries:
+                if not (entry.name.endswith(('.inx', '.py')) and entry.is_file()):
+                    continue
+                
+                target = inkscape_dir / entry.name
+                try:
+                    if os.path.samefile(entry.path, target):
+                        # Built straight into the extensions directory
+                        print(f"  ✔️ Already installed: {entry.name}")
+                        continue
+                except FileNotFoundError:
+                    pass
+                
+                # Link or copy under a temporary name and move that over the
+                # target, so a failed copy never removes the installed file
+                tmp = inkscape_dir / f".{entry.name}.{os.getpid()}.tmp"
+                try:
+                    try:
+                        os.link(entry.path, tmp)
+                    except OSError:
+                        # Cross-device link, or no hard link support/privilege
+                        import shutil
+                        shutil.copy2(entry.path, tmp)
+                    os.replace(tmp, target)
+                except BaseException:
+                    try:
+                        tmp.unlink()
+                    except FileNotFoundError:
+                        pass
+                    raise
+                
+                print(f"  📥 Installed: {entry.name}")
+        
+        print(f"✅ Installed to: {inkscape_dir}")
+        return inkscape_dir
 
 
 # SIMPLE TEST
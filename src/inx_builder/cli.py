@@ -4,20 +4,14 @@ INX Builder - Minimal working version
 """
 
 import argparse
-import os
 from pathlib import Path
 
 
-def create_simple_extension(name, ext_type, author, output_dir):
-    """Create a simple working extension"""
-    output_path = Path(output_dir)
-    output_path.mkdir(exist_ok=True)
-    
-    # Create .inx file
-    inx_content = f'''<?xml version="1.0" encoding="UTF-8"?>
+# Files written by create_simple_extension(), filled in with str.format_map()
+_SIMPLE_INX_TEMPLATE = '''<?xml version="1.0" encoding="UTF-8"?>
 <inkscape-extension xmlns="http://www.inkscape.org/namespace/inkscape/extension">
   <_name>{name}</_name>
-  <id>org.inkscape.effect.{name.lower().replace(" ", "_")}</id>
+  <id>org.inkscape.effect.{snake_name}</id>
   <dependency type="executable" location="extensions">python3</dependency>
   
   <param name="message" type="string" gui-text="Message" gui-description="Test message">Hello World!</param>
@@ -30,12 +24,11 @@ def create_simple_extension(name, ext_type, author, output_dir):
   </effect>
   
   <script>
-    <command location="inx" interpreter="python">{name.lower().replace(" ", "_")}.py</command>
+    <command location="inx" interpreter="python">{snake_name}.py</command>
   </script>
 </inkscape-extension>'''
-    
-    # Create .py file
-    py_content = f'''#!/usr/bin/env python3
+
+_SIMPLE_PY_TEMPLATE = '''#!/usr/bin/env python3
 """
 {name} - Generated with INX Builder
 """
@@ -43,7 +36,7 @@ def create_simple_extension(name, ext_type, author, output_dir):
 import inkex
 
 
-class {name.replace(" ", "")}(inkex.EffectExtension):
+class {class_name}(inkex.EffectExtension):
     """{name} extension"""
     
     def add_arguments(self, pars):
@@ -54,17 +47,27 @@ class {name.replace(" ", "")}(inkex.EffectExtension):
 
 
 if __name__ == '__main__':
-    {name.replace(" ", "")}().run()
+    {class_name}().run()
 '''
+
+
+def create_simple_extension(name, ext_type, author, output_dir):
+    """Create a simple working extension"""
+    output_path = Path(output_dir)
+    output_path.mkdir(exist_ok=True)
     
-    # Write files
     snake_name = name.lower().replace(" ", "_")
+    names = {
+        'name': name,
+        'snake_name': snake_name,
+        'class_name': name.replace(" ", ""),
+    }
+    inx_content = _SIMPLE_INX_TEMPLATE.format_map(names)
+    py_content = _SIMPLE_PY_TEMPLATE.format_map(names)
     
-    with open(output_path / f"{snake_name}.inx", "w") as f:
-        f.write(inx_content)
-    
-    with open(output_path / f"{snake_name}.py", "w") as f:
-        f.write(py_content)
+    # Write files
+    (output_path / f"{snake_name}.inx").write_bytes(inx_content.encode('utf-8'))
+    (output_path / f"{snake_name}.py").write_bytes(py_content.encode('utf-8'))
     
     print(f"✅ Created: {name}")
     print(f"📁 Location: {output_path}")
@@ -72,48 +75,33 @@ if __name__ == '__main__':
 
 def create_extension_from_template(name, ext_type, author, output_dir, template_name=None):
     """Create extension using template system"""
-    output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
-    
-    snake_name = name.lower().replace(' ', '_')
-    camel_name = ''.join(word.title() for word in name.split())
-    
     # Choose template
-    if template_name:
-        template_dir = Path(__file__).parent.parent / 'templates' / template_name
-    elif ext_type == 'render':
-        template_dir = Path(__file__).parent.parent / 'templates' / 'mondrian_render'
-    else:
-        template_dir = Path(__file__).parent.parent / 'templates' / 'basic_effect'
+    if not template_name:
+        template_name = 'mondrian_render' if ext_type == 'render' else 'basic_effect'
+    
+    # Render through the shared Jinja environment rather than substituting
+    # placeholders by hand, so loops and filters in the templates work too.
+    # Imported here so the plain `inx` path never loads Jinja or the config
+    # dataclasses.
+    from .builder import InxBuilder
+    from .config import ExtensionConfig
+    
+    config = ExtensionConfig(
+        name=name,
+        type=ext_type,
+        author=author,
+        description=f'{name} Inkscape Extension',
+    )
+    builder = InxBuilder(config, template_name)
     
+    template_dir = builder.templates_dir / template_name
     if not template_dir.exists():
         print(f"⚠️ Template not found: {template_dir}")
         return create_simple_extension(name, ext_type, author, output_dir)
     
-    # Read and process templates
-    for template_file in template_dir.glob('*.j2'):
-        with open(template_file, 'r', encoding='utf-8') as f:
-            template_content = f.read()
-        
-        # Simple template replacement (for now)
-        content = template_content
-        content = content.replace('{{ config.name }}', name)
-        content = content.replace('{{ config.author }}', author)
-        content = content.replace('{{ config.description }}', f'{name} Inkscape Extension')
-        content = content.replace('{{ ext_id }}', f'org.inkscape.{ext_type}.{snake_name}')
-        content = content.replace('{{ snake_name }}', snake_name)
-        content = content.replace('{{ camel_name }}', camel_name)
-        content = content.replace('{{ year }}', '2024')
-        
-        output_file = template_file.stem  # Remove .j2
-        if output_file == 'extension':
-            output_file = snake_name
-        
-        with open(output_path / output_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+    output_path = builder.build(output_dir, clean=False)
     
-    print(f"🎨 Created: {name} (using template: {template_dir.name})")
-    print(f"📁 Output: {output_path}")
+    print(f"🎨 Created: {name} (using template: {template_name})")
     
     return output_path
 
@@ -3,12 +3,15 @@ Configuration handling for INX Builder
 """
 
 import json
-import yaml
 from pathlib import Path
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields
 from typing import List, Dict, Any, Optional
 
 
+PARAMETER_TYPES = frozenset(['int', 'float', 'string', 'boolean', 'optiongroup', 'notebook'])
+EXTENSION_TYPES = frozenset(['effect', 'input', 'output', 'render', 'custom'])
+
+
 @dataclass
 class Parameter:
     """Extension parameter configuration"""
@@ -25,7 +28,7 @@ class Parameter:
     
     def validate(self):
         """Validate parameter configuration"""
-        if self.type not in ['int', 'float', 'string', 'boolean', 'optiongroup', 'notebook']:
+        if self.type not in PARAMETER_TYPES:
             raise ValueError(f"Invalid parameter type: {self.type}")
         
         if self.type == 'optiongroup' and not self.options:
@@ -36,6 +39,13 @@ class Parameter:
         
         if self.min is not None and self.max is not None and self.min > self.max:
             raise ValueError(f"min ({self.min}) cannot be greater than max ({self.max})")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization"""
+        data = dict(self.__dict__)
+        data['options'] = list(self.options)
+        data['pages'] = [dict(page) for page in self.pages]
+        return data
 
 
 @dataclass
@@ -55,14 +65,26 @@ class ExtensionConfig:
     def __post_init__(self):
         if not self.id:
             # Generate ID from name
-            clean_name = self.name.lower().replace(' ', '_').replace('-', '_')
+            clean_name = self.snake_name.replace('-', '_')
             self.id = f"org.inkscape.{self.type}.{clean_name}"
     
+    @property
+    def snake_name(self) -> str:
+        """Name used for the generated .inx/.py files"""
+        return self.name.lower().replace(' ', '_')
+    
+    @property
+    def camel_name(self) -> str:
+        """Name used for the generated extension class"""
+        return ''.join(word.title() for word in self.name.split())
+    
     def to_dict(self):
         """Convert to dictionary for serialization"""
-        data = asdict(self)
-        # Convert parameters to dicts
-        data['parameters'] = [asdict(p) for p in self.parameters]
+        # Copy the fields directly rather than via asdict(), which deep-copies
+        # every value and then walks the parameters a second time.
+        data = {name: getattr(self, name) for name in _CONFIG_FIELDS}
+        data['requires'] = list(self.requires)
+        data['parameters'] = [p.to_dict() for p in self.parameters]
         return data
     
     @classmethod
@@ -79,13 +101,16 @@ class ExtensionConfig:
         if not self.name:
             raise ValueError("Extension name is required")
         
-        if self.type not in ['effect', 'input', 'output', 'render', 'custom']:
+        if self.type not in EXTENSION_TYPES:
             raise ValueError(f"Invalid extension type: {self.type}")
         
         for param in self.parameters:
             param.validate()
 
 
+_CONFIG_FIELDS = tuple(f.name for f in fields(ExtensionConfig))
+
+
 def load_config(filepath: str) -> ExtensionConfig:
     """Load configuration from JSON or YAML file"""
     path = Path(filepath)
@@ -93,11 +118,15 @@ def load_config(filepath: str) -> ExtensionConfig:
     if not path.exists():
         raise FileNotFoundError(f"Config file not found: {filepath}")
     
-    with open(path, 'r') as f:
+    with open(path, 'r', encoding='utf-8') as f:
         if path.suffix.lower() == '.json':
             data = json.load(f)
         elif path.suffix.lower() in ['.yaml', '.yml']:
-            data = yaml.safe_load(f)
+            # PyYAML is only imported for YAML configs; prefer the libyaml
+            # based loader when it was compiled in
+            import yaml
+            loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+            data = yaml.load(f, Loader=loader)
         else:
             raise ValueError(f"Unsupported config file format: {path.suffix}")
     
@@ -106,8 +135,17 @@ def load_config(filepath: str) -> ExtensionConfig:
 
 def save_config(config: ExtensionConfig, filepath: str):
     """Save configuration to JSON file"""
-    with open(filepath, 'w') as f:
-        json.dump(config.to_dict(), f, indent=2)
+    data = config.to_dict()
+    try:
+        import orjson
+    except ImportError:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    else:
+        # json.dump() falls back to its pure-Python encoder whenever indent
+        # is set; orjson indents natively
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
 
 def validate_config(config: ExtensionConfig):
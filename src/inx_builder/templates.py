@@ -2,69 +2,267 @@
 Template definitions for different extension types
 """
 
-TEMPLATES = {
-    'basic_effect': {
-        'description': 'Basic effect extension with simple parameters',
-        'files': {
-            '{{ext_name}}.py.j2': 'main_effect.py',
-            '{{ext_name}}.inx.j2': 'extension.inx',
-            'README.md.j2': 'README.md',
-        },
-        'parameters': [
-            {
-                'name': 'width',
-                'type': 'float',
-                'default': 100.0,
-                'gui_text': 'Width',
-                'min': 1,
-                'max': 1000,
-            },
-            {
-                'name': 'height',
-                'type': 'float',
-                'default': 100.0,
-                'gui_text': 'Height',
-                'min': 1,
-                'max': 1000,
-            }
-        ]
-    },
-    'render': {
-        'description': 'Render extension (like Mondrian generator)',
-        'files': {
-            '{{ext_name}}.py.j2': 'main_render.py',
-            '{{ext_name}}.inx.j2': 'extension.inx',
-            'utils.py.j2': 'utils.py',
-            'generator.py.j2': 'generator.py',
-            'README.md.j2': 'README.md',
-        },
-        'parameters': [
-            {
-                'name': 'tab',
-                'type': 'notebook',
-                'pages': [
-                    {'name': 'canvas', 'gui_text': 'Canvas'},
-                    {'name': 'settings', 'gui_text': 'Settings'},
-                    {'name': 'advanced', 'gui_text': 'Advanced'},
-                ]
-            },
-            {
-                'name': 'seed',
-                'type': 'int',
-                'default': 0,
-                'gui_text': 'Random Seed',
-                'min': 0,
-                'max': 999999,
-            }
-        ]
-    },
-    'input_output': {
-        'description': 'Extension with file input/output',
-        'files': {
-            '{{ext_name}}.py.j2': 'main_io.py',
-            '{{ext_name}}.inx.j2': 'extension.inx',
-            'processor.py.j2': 'processor.py',
-            'README.md.j2': 'README.md',
-        }
-    }
-}
+from collections import namedtuple
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+
+class ParamType(IntEnum):
+    """Type of a template parameter; compares as a small int"""
+    FLOAT = 1
+    INT = 2
+    NOTEBOOK = 3
+
+    @property
+    def inx_name(self) -> str:
+        """Value of the INX ``type`` attribute"""
+        return self.name.lower()
+
+
+@dataclass(frozen=True)
+class Param:
+    """A parameter predefined by a template"""
+    name: str
+    type: ParamType
+    gui_text: str = ''
+    # (min, max, default) for numeric parameters, unpacked in one go
+    bounds: Optional[Tuple[float, float, float]] = None
+    # Notebook pages as parallel tuples; iterate with zip()
+    page_names: Tuple[str, ...] = ()
+    page_gui_texts: Tuple[str, ...] = ()
+
+
+# Template parameters stored column-wise: one tuple per field, indexed by
+# parameter position
+ParamsSoA = namedtuple(
+    'ParamsSoA',
+    'names types defaults gui_texts mins maxs page_names page_gui_texts',
+)
+
+
+_NO_BOUNDS = (None, None, None)
+
+
+def _to_soa(params: Sequence[Param]) -> ParamsSoA:
+    """Convert a sequence of Params into a ParamsSoA"""
+    if params:
+        mins, maxs, defaults = zip(*(p.bounds or _NO_BOUNDS for p in params))
+    else:
+        mins = maxs = defaults = ()
+    return ParamsSoA(
+        names=tuple(p.name for p in params),
+        types=tuple(p.type for p in params),
+        defaults=defaults,
+        gui_texts=tuple(p.gui_text for p in params),
+        mins=mins,
+        maxs=maxs,
+        page_names=tuple(p.page_names for p in params),
+        page_gui_texts=tuple(p.page_gui_texts for p in params),
+    )
+
+
+class TemplateFlags:
+    """Capability bits of a TemplateSpec, tested with ``spec.flags & ...``
+
+    Plain ints rather than an IntFlag so a test is a single C-level AND.
+    """
+    HAS_PARAMS = 1
+    HAS_NOTEBOOK = 2
+    HAS_UTILS = 4
+    HAS_GENERATOR = 8
+    HAS_PROCESSOR = 16
+
+
+# Optional helper module -> capability bit it implies
+_FILE_FLAGS = (
+    ('utils.py', TemplateFlags.HAS_UTILS),
+    ('generator.py', TemplateFlags.HAS_GENERATOR),
+    ('processor.py', TemplateFlags.HAS_PROCESSOR),
+)
+
+
+@dataclass(frozen=True)
+class TemplateSpec:
+    """Files and predefined parameters of a template"""
+    description: str
+    files: Tuple[Tuple[str, str], ...]
+    parameters: Tuple[Param, ...] = ()
+    params_soa: ParamsSoA = field(init=False, repr=False, compare=False)
+    # Names of the files the template produces, for O(1) membership checks
+    destinations: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    flags: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, 'params_soa', _to_soa(self.parameters))
+        object.__setattr__(self, 'destinations', frozenset(dst for _, dst in self.files))
+
+        flags = 0
+        if self.parameters:
+            flags |= TemplateFlags.HAS_PARAMS
+        if ParamType.NOTEBOOK in self.params_soa.types:
+            flags |= TemplateFlags.HAS_NOTEBOOK
+        for dst, flag in _FILE_FLAGS:
+            if dst in self.destinations:
+                flags |= flag
+        object.__setattr__(self, 'flags', flags)
+
+
+_DIMENSION_BOUNDS = (1, 1000, 100.0)
+
+
+def _dim(name: str, gui_text: str) -> Param:
+    """A float dimension parameter; all of them share one bounds tuple"""
+    return Param(name=name, type=ParamType.FLOAT, gui_text=gui_text, bounds=_DIMENSION_BOUNDS)
+
+
+# Files every template ships; the same pair objects are shared by all specs
+_INX_FILE = ('{{ext_name}}.inx.j2', 'extension.inx')
+_README_FILE = ('README.md.j2', 'README.md')
+_COMMON_FILES = (_INX_FILE, _README_FILE)
+
+
+# Specs are built on first use; see get_template() and __getattr__()
+def _build_basic_effect() -> TemplateSpec:
+    return TemplateSpec(
+        description='Basic effect extension with simple parameters',
+        files=(
+            ('{{ext_name}}.py.j2', 'main_effect.py'),
+        ) + _COMMON_FILES,
+        parameters=(
+            _dim('width', 'Width'),
+            _dim('height', 'Height'),
+        ),
+    )
+
+
+def _build_render() -> TemplateSpec:
+    return TemplateSpec(
+        description='Render extension (like Mondrian generator)',
+        files=(
+            ('{{ext_name}}.py.j2', 'main_render.py'),
+            ('utils.py.j2', 'utils.py'),
+            ('generator.py.j2', 'generator.py'),
+        ) + _COMMON_FILES,
+        parameters=(
+            Param(
+                name='tab',
+                type=ParamType.NOTEBOOK,
+                page_names=('canvas', 'settings', 'advanced'),
+                page_gui_texts=('Canvas', 'Settings', 'Advanced'),
+            ),
+            Param(
+                name='seed',
+                type=ParamType.INT,
+                gui_text='Random Seed',
+                bounds=(0, 999999, 0),
+            ),
+        ),
+    )
+
+
+def _build_input_output() -> TemplateSpec:
+    return TemplateSpec(
+        description='Extension with file input/output',
+        files=(
+            ('{{ext_name}}.py.j2', 'main_io.py'),
+            ('processor.py.j2', 'processor.py'),
+        ) + _COMMON_FILES,
+    )
+
+
+_TEMPLATE_BUILDERS = MappingProxyType({
+    'basic_effect': _build_basic_effect,
+    'render': _build_render,
+    'input_output': _build_input_output,
+})
+
+
+@lru_cache(maxsize=None)
+def get_template(name: str) -> TemplateSpec:
+    """Return the TemplateSpec registered as ``name``"""
+    try:
+        build = _TEMPLATE_BUILDERS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown template: {name} (available: {', '.join(_TEMPLATE_BUILDERS)})"
+        ) from None
+    return build()
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562: the full TEMPLATES mapping is only built when it is asked for,
+    # so looking up a single template doesn't construct the others
+    if name == 'ENV':
+        # The builder's Environment for the bundled templates, so metadata
+        # users and the renderer share one compiled-template cache
+        from .builder import _TEMPLATES_DIR, _get_env
+        env = _get_env(_TEMPLATES_DIR)
+        globals()['ENV'] = env
+        return env
+    if name == 'TEMPLATES':
+        templates = MappingProxyType({
+            template_name: get_template(template_name)
+            for template_name in _TEMPLATE_BUILDERS
+        })
+        globals()['TEMPLATES'] = templates
+        return templates
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=None)
+def _dst_index() -> Mapping[str, Tuple[str, ...]]:
+    """Destination file name -> names of the templates producing it"""
+    index: Dict[str, Tuple[str, ...]] = {}
+    for name in _TEMPLATE_BUILDERS:
+        for _, dst in get_template(name).files:
+            index[dst] = index.get(dst, ()) + (name,)
+    return MappingProxyType(index)
+
+
+def template_for(dst: str) -> Tuple[str, ...]:
+    """Return the names of the templates that produce the file ``dst``"""
+    return _dst_index().get(dst, ())
+
+
+_NAME_PLACEHOLDER = '{{ext_name}}'
+
+
+def _name_expr(pattern: str) -> str:
+    """Python expression rendering a ``{{ext_name}}`` file name pattern
+
+    The placeholder is substituted by plain string concatenation; file
+    names never go through Jinja.
+    """
+    terms: List[str] = []
+    for i, literal in enumerate(pattern.split(_NAME_PLACEHOLDER)):
+        if i:
+            terms.append('ext_name')
+        if literal:
+            terms.append(repr(literal))
+    return ' + '.join(terms) or "''"
+
+
+@lru_cache(maxsize=None)
+def _file_renderer(template_name: str) -> Callable[[str], Tuple[Tuple[str, str], ...]]:
+    """Generate a function returning a template's file pairs for an ext_name
+
+    The pairs are emitted as one tuple display, so rendering them runs no
+    loop and re-reads no pattern; only the module's own constants are
+    inlined into the generated source.
+    """
+    files = get_template(template_name).files
+    pairs = ''.join(f'\n        ({_name_expr(src)}, {dst!r}),' for src, dst in files)
+    func_name = f'_files_{template_name}'
+    source = f'def {func_name}(ext_name):\n    return ({pairs}\n    )\n'
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, f'<{__name__}:{func_name}>', 'exec'), namespace)
+    renderer: Callable[[str], Tuple[Tuple[str, str], ...]] = namespace[func_name]
+    return renderer
+
+
+def render_files(template_name: str, ext_name: str) -> Tuple[Tuple[str, str], ...]:
+    """Return the (source, destination) file pairs of a template for ``ext_name``"""
+    return _file_renderer(template_name)(ext_name)